@@ -70,109 +70,226 @@ coroutines can also yield like coroutines:
 '''
 
 from __future__ import annotations
-from typing import Callable, Any, Iterable, Mapping, Union, Optional, Generator
-from types import TracebackType
-from queue import Queue
-from dataclasses import dataclass
+from typing import (Callable, Any, Iterable, Union, Optional, Generator,
+                    List, Tuple, Dict)
+from types import TracebackType, FunctionType
 import functools
 import threading
-import enum
-import inspect
+import keyword
+import os
+import weakref
 
 __all__ = ['FakeCoroutine', 'fake_coro', 'yield_', 'yield_from']
 
 
-@enum.unique
-class _CoStatus(enum.Enum):
-    CREATED = enum.auto()
-    RUNNING = enum.auto()
-    SUSPENDED = enum.auto()
-    CLOSED = enum.auto()
+# status of a fake coroutine
+_STATUS_CREATED = 0
+_STATUS_RUNNING = 1
+_STATUS_SUSPENDED = 2
+_STATUS_CLOSED = 3
 
 
-@dataclass
-class _CoOpNext:
-    value: Any
+# ops passed from the caller into the fake coroutine
+_OP_NEXT = 0
+_OP_THROW = 1
+# ops passed from the fake coroutine back to the caller
+_OP_YIELD = 2
+_OP_RAISE = 3
 
 
-@dataclass
-class _CoOpThrow:
-    value: BaseException
+# flags of code objects, same as `inspect.CO_VARARGS` and
+# `inspect.CO_VARKEYWORDS`
+_CO_VARARGS = 0x04
+_CO_VARKEYWORDS = 0x08
 
 
-@dataclass
-class _CoOpYield:
-    value: Any
+_thread_local = threading.local()
 
 
-@dataclass
-class _CoOpRaise:
-    value: BaseException
+def _new_lock_signal() -> Tuple[Callable[[], Any], Callable[[], Any]]:
+    '''Returns `(wait, signal)`, where `wait` blocks until another thread
+    calls `signal`.  Each `signal` is followed by exactly one `wait`.
 
+    The lock is held until it is signalled, so it is a binary semaphore
+    released by another thread rather than a resource.'''
+    lock = threading.Lock()
+    lock.acquire()  # pylint: disable=consider-using-with
+    return lock.acquire, lock.release
 
-_thread_local = threading.local()
 
+if hasattr(os, 'eventfd'):  # linux, python 3.10+
+    def _new_signal(owner: object) -> Tuple[Callable[[], Any],
+                                            Callable[[], Any]]:
+        '''Same as `_new_lock_signal`, but with an eventfd, which wakes the
+        waiting thread with a single read(2) and write(2), without the futex
+        and GIL handover of a lock.  It is closed when `owner` is garbage
+        collected.  Falls back to a lock when no file descriptor is left.'''
+        # pylint: disable=no-member
+        try:
+            fd = os.eventfd(0)
+        except OSError:
+            return _new_lock_signal()
+        # workers may still be blocked on it at exit, leave it to the os then
+        weakref.finalize(owner, os.close, fd).atexit = False
+        return (functools.partial(os.eventfd_read, fd),
+                functools.partial(os.eventfd_write, fd, 1))
+else:  # pragma: no cover
+    def _new_signal(owner: object) -> Tuple[Callable[[], Any],
+                                            Callable[[], Any]]:
+        '''Same as `_new_lock_signal`.'''
+        # pylint: disable=unused-argument
+        return _new_lock_signal()
+
+
+# number of idle worker threads kept for later fake coroutines
+_MAX_IDLE_WORKERS = 4
+
+
+# idle workers shared by all fake coroutines, so that none is left behind
+# with a decorated function that is no longer used
+_idle_workers: List[_Worker] = []
+if hasattr(os, 'register_at_fork'):  # not on windows
+    # threads of the idle workers do not survive in a forked child
+    os.register_at_fork(after_in_child=_idle_workers.clear)
+
+
+class _Worker(threading.Thread):
+    '''A daemon thread which runs fake coroutines one after another and
+    waits in the pool of idle workers between them.'''
+
+    def __init__(self) -> None:
+        super().__init__(daemon=True)
+        self._coro: Optional[FakeCoroutine] = None
+        # single-slot channels, strict ping-pong between the caller and this
+        # thread, reused by each fake coroutine it runs
+        self._in_wait, self._in_signal = _new_signal(self)
+        self._out_wait, self._out_signal = _new_signal(self)
+
+    @classmethod
+    def from_pool(cls) -> _Worker:
+        '''Takes an idle worker from the pool or starts a new one.'''
+        if _idle_workers:
+            try:
+                return _idle_workers.pop()
+            except IndexError:  # pragma: no cover
+                pass  # emptied by another thread
+        worker = cls()
+        worker.start()
+        return worker
+
+    def release(self) -> None:
+        '''Puts this worker back into the pool, or stops it when the pool is
+        full.  Called by the caller once it has taken the final op, since the
+        out channel is reused by the next fake coroutine.'''
+        if len(_idle_workers) < _MAX_IDLE_WORKERS:
+            _idle_workers.append(self)
+        else:
+            self._in_signal()  # without a fake coroutine to run
 
-class FakeCoroutine:
+    def submit(self, coro: FakeCoroutine) -> None:
+        '''Starts running the fake coroutine in this worker.'''
+        # pylint: disable=protected-access
+        coro._worker = self
+        coro._in_wait = self._in_wait
+        coro._in_signal = self._in_signal
+        coro._out_wait = self._out_wait
+        coro._out_signal = self._out_signal
+        self._coro = coro
+        self._in_signal()
+
+    def run(self) -> None:
+        # pylint: disable=protected-access
+        while True:
+            self._in_wait()
+            coro = self._coro
+            if coro is None:
+                return  # stopped by `release`
+            self._coro = None
+            _thread_local.context = coro
+            coro._entrypoint()
+            # not kept alive while waiting for the next fake coroutine
+            del _thread_local.context, coro
+            self._out_signal()
+
+
+class FakeCoroutine:  # pylint: disable=too-many-instance-attributes
     '''Represents a fake coroutine.
 
     This class is intended for internal use and should not be instantiate
     directly, use `fake_coro` instead.'''
 
-    def __init__(self, func: Callable, args: Iterable[Any],
-                 kwargs: Mapping[str, Any]) -> None:
+    __slots__ = ('_func', '_args', '_kwargs', '_status',
+                 '_in_tag', '_in_val', '_in_wait', '_in_signal',
+                 '_out_tag', '_out_val', '_out_wait', '_out_signal',
+                 '_worker', '_delegate', '_chain', '__weakref__')
+
+    def __init__(self, func: Callable, args: Tuple[Any, ...],
+                 kwargs: Dict[str, Any]) -> None:
         self._func = func
         self._args = args
         self._kwargs = kwargs
-        self._status = _CoStatus.CREATED
-        self._queue_next_throw: Queue[
-            Union[_CoOpNext, _CoOpThrow]] = Queue(1)
-        self._queue_yield_raise: Queue[
-            Union[_CoOpYield, _CoOpRaise]] = Queue(1)
-        self._lock = threading.Lock()
-        self._thread = threading.Thread(
-            target=self._entrypoint,
-            args=(self, func, args, kwargs), daemon=True)
-        self._thread.start()
-
-    def _entrypoint(self, context: FakeCoroutine, func: Callable,
-                    args: Iterable[Any], kwargs: Mapping[str, Any]):
-        # pylint: disable=protected-access
-        _thread_local.context = context  # type: ignore
-        result = self._queue_next_throw.get()
-        if isinstance(result, _CoOpNext):
-            pass
-        elif isinstance(result, _CoOpThrow):
-            try:
-                raise result.value
-                # pylint: disable=broad-exception-caught
-            except BaseException as exc:
-                self._status = _CoStatus.CLOSED
-                self._queue_yield_raise.put(_CoOpRaise(exc))
-                return
-        else:  # pragma: no cover
-            self._queue_yield_raise.put(_CoOpRaise(
-                RuntimeError('unexpected result from fake coroutine')))
-            return
+        self._status = _STATUS_CREATED
+        # ops are passed through these slots, the receiver is woken by the
+        # channels of the worker, which are set from the first `send`
+        self._in_tag = _OP_NEXT
+        self._in_val: Any = None
+        self._in_wait: Callable[[], Any]
+        self._in_signal: Callable[[], Any]
+        self._out_tag = _OP_YIELD
+        self._out_val: Any = None
+        self._out_wait: Callable[[], Any]
+        self._out_signal: Callable[[], Any]
+        # a worker from the pool runs the fake coroutine from the first `send`,
+        # it is kept referenced so that its channels stay open
+        self._worker: Optional[_Worker] = None
+        # the fake coroutine being yielded from, resumed by the caller directly
+        self._delegate: Optional[FakeCoroutine] = None
+        # the fake coroutines between this one and the innermost one, kept
+        # between resumptions, see `_resume_delegate`
+        self._chain: List[FakeCoroutine] = []
+
+    def _entrypoint(self) -> None:
+        '''Runs the function in a worker thread and leaves the final op for
+        the worker to pass back to the caller.'''
+        func, args, kwargs = self._func, self._args, self._kwargs
+        # the fake coroutine does not keep its arguments alive once started
+        del self._func, self._args, self._kwargs
         try:
             return_value = func(*args, **kwargs)
         except StopIteration as exc:
-            try:
-                raise RuntimeError('fake coroutine raised'
-                                   ' StopIteration') from exc
-            except RuntimeError as exc1:
-                self._status = _CoStatus.CLOSED
-                self._queue_yield_raise.put(_CoOpRaise(exc1))
-                return
+            # what `raise RuntimeError(...) from exc` would set up, without
+            # actually raising it here
+            error = RuntimeError('fake coroutine raised StopIteration')
+            error.__cause__ = error.__context__ = exc
+            error.__suppress_context__ = True
+            self._out_val = error
+            del error  # references this frame through `exc`
         except BaseException as exc:  # pylint: disable=broad-exception-caught
-            self._status = _CoStatus.CLOSED
-            self._queue_yield_raise.put(_CoOpRaise(exc))
-            return
-        try:
-            raise StopIteration(return_value)
-        except StopIteration as exc:
-            self._status = _CoStatus.CLOSED
-            self._queue_yield_raise.put(_CoOpRaise(exc))
+            self._out_val = exc
+        else:
+            self._out_val = StopIteration(return_value)
+        self._out_tag = _OP_RAISE
+
+    def _finish(self) -> BaseException:
+        '''Closes the fake coroutine once the caller has taken its final op,
+        hands its worker over to the next one and returns the exception to
+        raise.'''
+        self._status = _STATUS_CLOSED
+        self._worker.release()  # type: ignore
+        error = self._out_val
+        self._out_val = None
+        return error
+
+    def _take_in_val(self) -> Any:
+        '''Returns the value passed into the fake coroutine and clears it.
+
+        The payload slots are cleared once taken, so that they do not keep
+        values alive.  Exceptions are raised right from the return value, as
+        a local variable holding one would be kept alive by its own traceback,
+        together with everything else in the frame.'''
+        value = self._in_val
+        self._in_val = None
+        return value
 
     def __iter__(self) -> FakeCoroutine:
         return self
@@ -183,30 +300,38 @@ class FakeCoroutine:
     def send(self, arg: Any) -> Any:
         '''send `arg` into fake coroutine, return next yielded value or raise
         StopIteration.'''
-        if self._status == _CoStatus.RUNNING:
+        status = self._status
+        if status == _STATUS_RUNNING:
             raise ValueError('fake coroutine already executing')
-        if self._status == _CoStatus.CLOSED:
+        if status == _STATUS_CLOSED:
             raise StopIteration()
-        if self._status == _CoStatus.CREATED and arg is not None:
-            raise TypeError("can't send non-None value to a just-started"
-                            " fake coroutine")
-        with self._lock:
-            self._status = _CoStatus.RUNNING
-            self._queue_next_throw.put(_CoOpNext(arg))
-            result = self._queue_yield_raise.get()
-            if isinstance(result, _CoOpYield):
-                return result.value
-            if isinstance(result, _CoOpRaise):
-                raise result.value
-            raise RuntimeError(  # pragma: no cover
-                'unexpected result from fake coroutine')
+        if status == _STATUS_CREATED:
+            if arg is not None:
+                raise TypeError("can't send non-None value to a just-started"
+                                " fake coroutine")
+            worker = _Worker.from_pool()
+            self._status = _STATUS_RUNNING
+            worker.submit(self)
+        elif self._delegate is not None:
+            return self._resume_delegate(_OP_NEXT, arg)
+        else:
+            self._status = _STATUS_RUNNING
+            self._in_tag = _OP_NEXT
+            self._in_val = arg
+            self._in_signal()
+        self._out_wait()
+        if self._out_tag == _OP_YIELD:
+            self._status = _STATUS_SUSPENDED
+            value = self._out_val
+            self._out_val = None
+            return value
+        raise self._finish()  # _OP_RAISE
 
     def close(self) -> None:
         '''raise GeneratorExit inside fake coroutine.'''
-        if self._status == _CoStatus.RUNNING:
+        if self._status == _STATUS_RUNNING:
             raise ValueError('fake coroutine already executing')
-        if self._status in [_CoStatus.CREATED,
-                            _CoStatus.SUSPENDED]:
+        if self._status in (_STATUS_CREATED, _STATUS_SUSPENDED):
             try:
                 self.throw(GeneratorExit())
             except (StopIteration, GeneratorExit):
@@ -215,7 +340,8 @@ class FakeCoroutine:
     def __del__(self) -> None:  # pragma: no cover
         self.close()
 
-    def throw(self, exc: Union[BaseException, type],
+    def throw(self,  # pylint: disable=too-many-branches
+              exc: Union[BaseException, type],
               value: Optional[BaseException] = None,
               # pylint: disable=invalid-name
               tb: Optional[TracebackType] = None) -> Any:
@@ -224,9 +350,10 @@ class FakeCoroutine:
 
         Raise exception in fake coroutine, return next yielded value or raise
         StopIteration.'''
-        if self._status == _CoStatus.RUNNING:
+        status = self._status
+        if status == _STATUS_RUNNING:
             raise ValueError('fake coroutine already executing')
-        if self._status == _CoStatus.CLOSED:
+        if status == _STATUS_CLOSED:
             raise StopIteration()
         if tb is not None and not isinstance(tb, TracebackType):
             raise TypeError(
@@ -248,29 +375,165 @@ class FakeCoroutine:
             raise TypeError(
                 f'exceptions must be classes or instances deriving from'
                 f' BaseException, not {type(exc).__name__}')
-        with self._lock:
-            self._status = _CoStatus.RUNNING
-            self._queue_next_throw.put(_CoOpThrow(value))
-            result = self._queue_yield_raise.get()
-            if isinstance(result, _CoOpYield):
-                return result.value
-            if isinstance(result, _CoOpRaise):
-                raise result.value
-            raise RuntimeError(  # pragma: no cover
-                'unexpected result from fake coroutine')
+        # not kept in this frame, the exception may be raised back out of it
+        self._in_val = value
+        del exc, value, tb
+        if status == _STATUS_CREATED:
+            # the function body never runs, so no thread is needed
+            self._status = _STATUS_CLOSED
+            del self._func, self._args, self._kwargs
+            raise self._take_in_val()
+        if self._delegate is not None:
+            return self._resume_delegate(_OP_THROW, self._take_in_val())
+        self._status = _STATUS_RUNNING
+        self._in_tag = _OP_THROW
+        self._in_signal()
+        self._out_wait()
+        if self._out_tag == _OP_YIELD:
+            self._status = _STATUS_SUSPENDED
+            value = self._out_val
+            self._out_val = None
+            return value
+        raise self._finish()  # _OP_RAISE
+
+    def _resume_delegate(self, tag: int, value: Any) -> Any:
+        '''Resumes the innermost fake coroutine being yielded from right from
+        the caller's thread, so yielded values skip the threads in between.
+        Once it stops, its result is passed to the `yield_from` waiting in its
+        parent, and so on outwards until one of them yields.
+
+        The chain down to the innermost fake coroutine is kept and only
+        extended or shortened when delegation changes, so resuming it costs
+        the same at any depth.'''
+        # pylint: disable=protected-access
+        chain = self._chain
+        # drops the fake coroutines stopped while resumed from elsewhere, the
+        # ones above a fake coroutine still yielding from another are intact
+        while chain and chain[-1]._delegate is None:
+            chain.pop()
+        coro: FakeCoroutine = (chain[-1]._delegate if chain  # type: ignore
+                               else self._delegate)
+        while coro._delegate is not None:
+            chain.append(coro)
+            coro = coro._delegate
+        # the ones in between are not marked as running, a resumption through
+        # any of them ends up here
+        if coro._status == _STATUS_RUNNING:
+            raise ValueError('fake coroutine already executing')
+        self._status = _STATUS_RUNNING
+        try:
+            if tag == _OP_NEXT:
+                result = coro.send(value)
+            else:
+                result = coro.throw(value)
+        except BaseException as exc:  # pylint: disable=broad-exception-caught
+            error = exc
+        else:
+            self._status = _STATUS_SUSPENDED
+            return result
+        del value
+        while True:
+            coro = chain.pop() if chain else self
+            coro._delegate = None
+            if isinstance(error, StopIteration):
+                coro._in_tag = _OP_NEXT
+                coro._in_val = error.value
+            else:
+                coro._in_tag = _OP_THROW
+                coro._in_val = error
+            del error
+            coro._status = _STATUS_RUNNING
+            coro._in_signal()
+            coro._out_wait()
+            if coro._out_tag == _OP_YIELD:
+                coro._status = _STATUS_SUSPENDED
+                self._status = _STATUS_SUSPENDED
+                value = coro._out_val
+                coro._out_val = None
+                return value
+            if coro is self:
+                raise self._finish()  # _OP_RAISE
+            error = coro._finish()
+
+
+def _make_inner(  # pylint: disable=too-many-locals
+        func: Callable) -> Callable[..., FakeCoroutine]:
+    '''Returns a function creating fake coroutines of `func`.
+
+    For plain functions it is compiled with exactly the parameters of `func`,
+    so that arguments are checked by the interpreter when it is called and
+    passed on without packing them into `*args` and `**kwargs` first.'''
+    if not isinstance(func, FunctionType):
+        # pylint: disable=import-outside-toplevel
+        import inspect
+        signature = inspect.signature(func)
+
+        def inner(*args, **kwargs) -> FakeCoroutine:
+            # checks whether arguments match the signature
+            signature.bind(*args, **kwargs)
+            return FakeCoroutine(func, args, kwargs)
+        return inner
+    code = func.__code__
+    n_positional = code.co_argcount
+    n_kwonly = code.co_kwonlyargcount
+    # python 3.8+
+    n_posonly = getattr(code, 'co_posonlyargcount', 0)
+    positional = list(code.co_varnames[:n_positional])
+    kwonly = list(code.co_varnames[n_positional:n_positional + n_kwonly])
+    rest = iter(code.co_varnames[n_positional + n_kwonly:])
+    varargs = next(rest) if code.co_flags & _CO_VARARGS else None
+    varkw = next(rest) if code.co_flags & _CO_VARKEYWORDS else None
+
+    params = positional.copy()
+    if n_posonly:
+        params.insert(n_posonly, '/')
+    if varargs is not None:
+        params.append(f'*{varargs}')
+    elif kwonly:
+        params.append('*')
+    params += kwonly
+    args = positional.copy()
+    kwargs = [f'{name!r}: {name}' for name in kwonly]
+    if varargs is not None:
+        args.append(f'*{varargs}')
+    if varkw is not None:
+        params.append(f'**{varkw}')
+        kwargs.append(f'**{varkw}')
+
+    name = func.__name__
+    if not name.isidentifier() or keyword.iskeyword(name):
+        name = 'inner'
+    # names used by the generated code must not collide with parameters
+    prefix = '_fake_coro'
+    while any(n.startswith(prefix) for n in (name, *code.co_varnames)):
+        prefix += '_'
+    source = (
+        f'def {prefix}_make({prefix}_cls, {prefix}_func):\n'
+        f'    def {name}({", ".join(params)}):\n'
+        f'        return {prefix}_cls({prefix}_func,'
+        f' ({"".join(f"{arg}, " for arg in args)}),'
+        f' {{{", ".join(kwargs)}}})\n'
+        f'    return {name}\n')
+    namespace: Dict[str, Any] = {}
+    exec(source, namespace)  # pylint: disable=exec-used
+    inner = namespace[f'{prefix}_make'](FakeCoroutine, func)
+    # copied rather than looked up in `func` on each call, as the parameters
+    # of `inner` which have defaults are fixed as well
+    inner.__defaults__ = func.__defaults__
+    inner.__kwdefaults__ = func.__kwdefaults__
+    return inner
 
 
 def fake_coro(func: Callable) -> Callable[..., FakeCoroutine]:
     '''Create a fake coroutine, which is emulated with threads.
 
-    Fake coroutines are thread-safe but are not intended for multi-processing
-    context.'''
-    @functools.wraps(func)
-    def inner(*args, **kwargs) -> FakeCoroutine:
-        # checks whether arguments match the signature
-        inspect.signature(func).bind(*args, **kwargs)
-        return FakeCoroutine(func, args, kwargs)
-    return inner
+    A fake coroutine may be resumed from any thread, but like a generator it
+    must not be resumed from two threads at the same time.  Fake coroutines are
+    not intended for multi-processing context.
+
+    The parameters of `func` and their defaults are read once when it is
+    decorated, defaults assigned to `func` afterwards are not used.'''
+    return functools.wraps(func)(_make_inner(func))
 
 
 def _current_context() -> FakeCoroutine:
@@ -296,17 +559,21 @@ def yield_(*value: Any) -> Any:
         value_or_none = value[0]
     else:
         value_or_none = value
-    context = _current_context()
-    context._status = _CoStatus.SUSPENDED
-    context._queue_yield_raise.put(_CoOpYield(value_or_none))
-    result = context._queue_next_throw.get()
-    context._status = _CoStatus.RUNNING
-    if isinstance(result, _CoOpNext):
-        return result.value
-    if isinstance(result, _CoOpThrow):
-        raise result.value
-    raise RuntimeError(  # pragma: no cover
-        'unexpected result from fake coroutine')
+    # inlined `_current_context`, this is the hot path
+    try:
+        context = _thread_local.context
+    except AttributeError:
+        # pylint: disable=raise-missing-from
+        raise RuntimeError('not in fake coroutine')
+    context._out_tag = _OP_YIELD
+    context._out_val = value_or_none
+    context._out_signal()
+    context._in_wait()
+    if context._in_tag == _OP_NEXT:
+        value_or_none = context._in_val
+        context._in_val = None
+        return value_or_none
+    raise context._take_in_val()  # _OP_THROW
 
 
 # pylint: disable=protected-access
@@ -320,24 +587,37 @@ def yield_from(coro: Union[Iterable, Generator, FakeCoroutine]) -> Any:
         yield_value = next(coro)
     except StopIteration as exc:
         return exc.value
+    if isinstance(coro, FakeCoroutine):
+        # from now on the caller resumes `coro` directly and only wakes this
+        # thread when it stops, see `FakeCoroutine._resume_delegate`
+        context._delegate = coro
+        context._out_tag = _OP_YIELD
+        context._out_val = yield_value
+        context._out_signal()
+        context._in_wait()
+        if context._in_tag == _OP_NEXT:
+            return context._take_in_val()  # returned by `coro`
+        raise context._take_in_val()  # _OP_THROW
+    throw = getattr(coro, 'throw', None)
     while True:
-        context._status = _CoStatus.SUSPENDED
-        context._queue_yield_raise.put(_CoOpYield(yield_value))
-        result = context._queue_next_throw.get()
-        context._status = _CoStatus.RUNNING
-        if isinstance(result, _CoOpNext):
+        context._out_tag = _OP_YIELD
+        context._out_val = yield_value
+        context._out_signal()
+        context._in_wait()
+        if context._in_tag == _OP_NEXT:
+            sent = context._in_val
+            context._in_val = None
             try:
-                if result.value is None:
+                if sent is None:
                     yield_value = next(coro)
                 else:
-                    yield_value = coro.send(result.value)  # type: ignore
+                    yield_value = coro.send(sent)  # type: ignore
+            except StopIteration as exc:
+                return exc.value
+        else:  # _OP_THROW
+            if throw is None:
+                raise context._take_in_val()
+            try:
+                yield_value = throw(context._take_in_val())
             except StopIteration as exc:
                 return exc.value
-        if isinstance(result, _CoOpThrow):
-            if hasattr(coro, 'throw'):
-                try:
-                    yield_value = coro.throw(result.value)  # type: ignore
-                except StopIteration as exc:
-                    return exc.value
-            else:
-                raise result.value
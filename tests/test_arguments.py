@@ -0,0 +1,94 @@
+import functools
+import sys
+
+import pytest
+
+from fake_coro import fake_coro, yield_
+
+
+@fake_coro
+def func1(a, b=2, *args, c, d=4, **kwargs):
+    yield_(a, b, args, c, d, kwargs)
+
+
+@fake_coro
+def func2(a, *, b):
+    yield_(a, b)
+
+
+def func3(a, b):
+    yield_(a, b)
+
+
+@fake_coro
+def func6(_fake_coro_cls, _fake_coro_func=2):
+    yield_(_fake_coro_cls, _fake_coro_func)
+
+
+def test_arguments():
+    assert list(func1(1, c=3)) == [(1, 2, (), 3, 4, {})]
+    assert list(func1(1, 2, 5, c=3, e=6)) == [(1, 2, (5,), 3, 4, {'e': 6})]
+    with pytest.raises(TypeError, match=(
+            "missing 1 required positional argument: 'a'")):
+        func1(c=3)
+    with pytest.raises(TypeError, match=(
+            "missing 1 required keyword-only argument: 'c'")):
+        func1(1)
+    with pytest.raises(TypeError, match="multiple values for argument 'a'"):
+        func1(1, a=1, c=3)
+
+    assert list(func2(1, b=2)) == [(1, 2)]
+    with pytest.raises(TypeError, match=(
+            'takes 1 positional argument but 2 were given')):
+        func2(1, 2)
+    with pytest.raises(TypeError, match=(
+            "got an unexpected keyword argument 'c'")):
+        func2(1, b=2, c=3)
+
+    # parameters named like the generated code
+    assert list(func6(1)) == [(1, 2)]
+    assert func6.__name__ == 'func6'
+
+    # defaults are read when decorating
+    func7 = fake_coro(lambda a=1, *, b=2: yield_(a, b))
+    func7.__wrapped__.__defaults__ = (5,)
+    func7.__wrapped__.__kwdefaults__ = {'b': 6}
+    assert list(func7()) == [(1, 2)]
+    assert list(func7(3, b=4)) == [(3, 4)]
+    func8 = fake_coro(lambda a, b=1: yield_(a, b))
+    func8.__wrapped__.__defaults__ = (7, 8)
+    assert list(func8(1)) == [(1, 1)]
+    with pytest.raises(TypeError, match=(
+            "missing 1 required positional argument: 'a'")):
+        func8()
+    func8.__wrapped__.__defaults__ = None
+    assert list(func8(1)) == [(1, 1)]
+
+    coro = fake_coro(lambda a: yield_(a))
+    assert list(coro(1)) == [1]
+
+    # not a plain function
+    coro = fake_coro(functools.partial(func3, 1))
+    assert list(coro(2)) == [(1, 2)]
+    with pytest.raises(TypeError):
+        coro()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8),
+                    reason='positional-only parameters require python 3.8')
+def test_positional_only():
+    namespace = {'yield_': yield_}
+    exec('def func4(a, /, **kwargs):\n'
+         '    yield_(a, kwargs)\n'
+         'def func5(a, /):\n'
+         '    yield_(a)\n', namespace)
+    func4 = fake_coro(namespace['func4'])
+    func5 = fake_coro(namespace['func5'])
+
+    assert list(func4(1, a=2)) == [(1, {'a': 2})]
+    with pytest.raises(TypeError, match=(
+            "missing 1 required positional argument: 'a'")):
+        func4(a=2)
+    with pytest.raises(TypeError, match=(
+            'positional-only arguments passed as keyword arguments')):
+        func5(a=1)
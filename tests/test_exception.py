@@ -2,7 +2,7 @@ import pytest
 
 import traceback
 
-from fake_coro import fake_coro, yield_
+from fake_coro import fake_coro, yield_, yield_from
 
 
 @fake_coro
@@ -41,37 +41,68 @@ def func5():
 
 
 def test_exception():
-    with pytest.raises(RuntimeError, match='not in fake coroutine'):
+    try:
         yield_()
+    except RuntimeError as error:
+        assert 'not in fake coroutine' in str(error)
+    else:
+        pytest.fail('RuntimeError is not raised')
+    try:
+        yield_from(range(1))
+    except RuntimeError as error:
+        assert 'not in fake coroutine' in str(error)
+    else:
+        pytest.fail('RuntimeError is not raised')
 
-    with pytest.raises(TypeError, match='too many positional arguments'):
+    try:
         coro = func1(1)
+    except TypeError as error:
+        assert 'takes 0 positional arguments but 1 was given' in str(error)
+    else:
+        pytest.fail('TypeError is not raised')
 
     coro = func1()
-    with pytest.raises(TypeError, match=(
-            "can't send non-None value to a just-started fake coroutine")):
+    try:
         coro.send(1)
+    except TypeError as error:
+        assert ("can't send non-None value to a just-started fake coroutine"
+                in str(error))
+    else:
+        pytest.fail('TypeError is not raised')
 
     coro = func1()
-    with pytest.raises(TypeError, match=(
-            r'throw\(\) third argument must be a traceback object')):
+    try:
         coro.throw(ZeroDivisionError, ZeroDivisionError(), 1)
+    except TypeError as error:
+        assert ('throw() third argument must be a traceback object'
+                in str(error))
+    else:
+        pytest.fail('TypeError is not raised')
 
     coro = func1()
-    with pytest.raises(TypeError, match=(
-            'instance exception may not have a separate value')):
+    try:
         coro.throw(ZeroDivisionError(), ZeroDivisionError())
+    except TypeError as error:
+        assert 'instance exception may not have a separate value' in str(error)
+    else:
+        pytest.fail('TypeError is not raised')
 
     coro = func1()
-    with pytest.raises(TypeError, match=(
-            'exceptions must be classes or instances deriving from'
-            ' BaseException, not int')):
+    try:
         coro.throw(1)
+    except TypeError as error:
+        assert ('exceptions must be classes or instances deriving from'
+                ' BaseException, not int') in str(error)
+    else:
+        pytest.fail('TypeError is not raised')
 
     coro = func1()
-    with pytest.raises(ZeroDivisionError,
-                       match='this is the correct exception'):
+    try:
         coro.throw(ZeroDivisionError('this is the correct exception'))
+    except ZeroDivisionError as error:
+        assert 'this is the correct exception' in str(error)
+    else:
+        pytest.fail('ZeroDivisionError is not raised')
     with pytest.raises(StopIteration):
         next(coro)
 
@@ -100,9 +131,12 @@ def test_exception():
 
     coro = func1()
     next(coro)
-    with pytest.raises(ZeroDivisionError,
-                       match='this is another exception'):
+    try:
         coro.throw(ZeroDivisionError('this is another exception'))
+    except ZeroDivisionError as error:
+        assert 'this is another exception' in str(error)
+    else:
+        pytest.fail('ZeroDivisionError is not raised')
     with pytest.raises(StopIteration):
         coro.throw(ZeroDivisionError('this is yet another exception'))
 
@@ -1,5 +1,7 @@
 import itertools
 
+import pytest
+
 from fake_coro import fake_coro, yield_
 
 
@@ -11,6 +13,26 @@ def fib():
         a, b = b, a + b
 
 
+def fib_expected(n):
+    result = []
+    a, b = 1, 1
+    for _ in range(n):
+        result.append(a)
+        a, b = b, a + b
+    return result
+
+
+def main(n):
+    gen = fib()
+    assert list(itertools.islice(gen, n)) == fib_expected(n)
+
+
 def test_fib():
     gen = fib()
     assert list(itertools.islice(gen, 5)) == [1, 1, 2, 3, 5]
+
+
+@pytest.mark.parametrize('n', [100, 10_000])
+def test_fib_long(n):
+    # long enough for a tracing JIT (PyPy) to warm up on the switch loop
+    main(n)
@@ -0,0 +1,96 @@
+import gc
+import platform
+import weakref
+
+import pytest
+
+from fake_coro import fake_coro, yield_, yield_from
+
+
+@fake_coro
+def func1(value):
+    yield_(value)
+    return value
+
+
+@fake_coro
+def func2():
+    raise StopIteration
+
+
+@fake_coro
+def func3(coro):
+    return yield_from(coro)
+
+
+def gen():
+    yield
+
+
+def run(coro, throw=False):
+    try:
+        if throw:
+            coro.throw(ZeroDivisionError)
+        while True:
+            next(coro)
+    except (StopIteration, ZeroDivisionError, RuntimeError):
+        pass
+
+
+@pytest.mark.skipif(platform.python_implementation() != 'CPython',
+                    reason='no reference counting')
+def test_gc():
+    # finished fake coroutines are freed by reference counting alone
+    gc.collect()
+    gc.disable()
+    try:
+        run(func1(object()))
+        run(func1(object()), throw=True)
+        coro = func1(object())
+        next(coro)
+        run(coro, throw=True)
+        run(func2())
+        run(func3(func1(object())))
+        coro = func3(func1(object()))
+        next(coro)
+        run(coro, throw=True)
+        coro = func3(gen())
+        next(coro)
+        run(coro, throw=True)
+        del coro
+        assert gc.collect() == 0
+    finally:
+        gc.enable()
+
+
+def test_gc_arguments():
+    # a fake coroutine closed before it starts drops its arguments too
+    value = type('Value', (), {})()
+    ref = weakref.ref(value)
+    coro = func1(value)
+    del value
+    with pytest.raises(ZeroDivisionError):
+        coro.throw(ZeroDivisionError)
+    gc.collect()  # pypy
+    assert ref() is None
+    with pytest.raises(StopIteration):
+        next(coro)
+
+    value = type('Value', (), {})()
+    ref = weakref.ref(value)
+    coro = func1(value)
+    del value
+    coro.close()
+    gc.collect()  # pypy
+    assert ref() is None
+
+
+def test_weakref():
+    # like generators, fake coroutines can be referenced weakly
+    coro = func1(1)
+    ref = weakref.ref(coro)
+    assert ref() is coro
+    assert list(coro) == [1]
+    del coro
+    gc.collect()  # pypy
+    assert ref() is None
@@ -1,6 +1,6 @@
 import pytest
 
-from fake_coro import fake_coro, yield_
+from fake_coro import fake_coro, yield_, yield_from
 
 
 @fake_coro
@@ -18,6 +18,19 @@ def func3():
     self = yield_()
     self.throw(ZeroDivisionError)
 
+@fake_coro
+def func4():
+    outer = yield_()
+    next(outer)
+
+@fake_coro
+def func5():
+    yield_from(func4())
+
+@fake_coro
+def func6(coro):
+    yield_from(coro)
+
 
 def test_race_condition():
     coro = func1()
@@ -36,3 +49,18 @@ def test_race_condition():
     next(coro)
     with pytest.raises(ValueError, match='fake coroutine already executing'):
         coro.send(coro)
+
+    coro = func5()
+    next(coro)
+    with pytest.raises(ValueError, match='fake coroutine already executing'):
+        coro.send(coro)
+    with pytest.raises(StopIteration):
+        next(coro)
+
+    inner = func5()
+    coro = func6(inner)
+    next(coro)
+    with pytest.raises(ValueError, match='fake coroutine already executing'):
+        coro.send(inner)
+    with pytest.raises(StopIteration):
+        next(coro)
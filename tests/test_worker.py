@@ -0,0 +1,136 @@
+import os
+import signal
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+import pytest
+
+from fake_coro import fake_coro, yield_
+
+
+@fake_coro
+def ident():
+    yield_(threading.get_ident())
+
+
+def test_worker():
+    # a finished fake coroutine hands its thread over to the next one
+    assert len({list(ident())[0] for _ in range(10)}) == 1
+
+    # more fake coroutines than the pool keeps
+    coros = [ident() for _ in range(10)]
+    assert len({next(coro) for coro in coros}) == 10
+    for coro in coros:
+        with pytest.raises(StopIteration):
+            next(coro)
+    assert len({list(ident())[0] for _ in range(10)}) == 1
+
+
+def test_worker_shared():
+    # idle workers are not kept per decorated function
+    before = threading.active_count()
+    for _ in range(200):
+        assert len(list(fake_coro(lambda: yield_(1))())) == 1
+    assert threading.active_count() <= before + 4
+
+
+@pytest.mark.skipif(not hasattr(sys, 'getrefcount'),
+                    reason='no reference counting')
+def test_worker_release():
+    # a finished fake coroutine is not kept by its worker
+    coro = ident()
+    list(coro)
+    assert sys.getrefcount(coro) == 2
+
+
+@fake_coro
+def echo(value):
+    yield_(value)
+
+
+def test_worker_threads():
+    # callers in several threads take workers from the same pool
+    errors = []
+
+    def target(index):
+        for i in range(1000):
+            coro = echo((index, i))
+            if next(coro) != (index, i):
+                errors.append((index, i))
+                return
+            try:
+                next(coro)
+            except StopIteration:
+                pass
+            else:
+                errors.append((index, i))
+                return
+
+    threads = [threading.Thread(target=target, args=(index,))
+               for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+
+
+@pytest.mark.skipif(not hasattr(os, 'eventfd') or resource is None,
+                    reason='eventfd is not used')
+def test_worker_fd_limit():
+    # workers fall back to locks once file descriptors run out
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    n_open = len(os.listdir('/proc/self/fd'))
+    resource.setrlimit(resource.RLIMIT_NOFILE, (n_open + 16, hard))
+    try:
+        coros = [echo(i) for i in range(50)]
+        assert [next(coro) for coro in coros] == list(range(50))
+        for coro in coros:
+            with pytest.raises(StopIteration):
+                next(coro)
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+
+def test_worker_start_failure(monkeypatch):
+    def start(self):
+        raise RuntimeError("can't start new thread")
+
+    # the idle workers are all taken
+    coros = [echo(i) for i in range(10)]
+    assert [next(coro) for coro in coros] == list(range(10))
+    coro = echo(10)
+    with monkeypatch.context() as patch:
+        patch.setattr(threading.Thread, 'start', start)
+        with pytest.raises(RuntimeError, match="can't start new thread"):
+            next(coro)
+    # the fake coroutine which got no worker can still be started
+    assert next(coro) == 10
+    for coro in [*coros, coro]:
+        with pytest.raises(StopIteration):
+            next(coro)
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='os.fork is missing')
+def test_worker_fork():
+    # idle workers of the parent are not handed out in the child
+    assert list(echo(1)) == [1]
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        os._exit(0 if list(echo(2)) == [2] else 1)
+    for _ in range(200):
+        waited, status = os.waitpid(pid, os.WNOHANG)
+        if waited:
+            break
+        time.sleep(0.01)
+    else:
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        pytest.fail('the forked child hangs')
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
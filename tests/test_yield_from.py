@@ -1,3 +1,7 @@
+import itertools
+import sys
+import time
+
 import pytest
 
 from fake_coro import fake_coro, yield_, yield_from
@@ -5,11 +9,54 @@ from fake_coro import fake_coro, yield_, yield_from
 
 @fake_coro
 def tree(iterable, level=0):
+    stack = [(iter(iterable), level)]
+    while stack:
+        it, level = stack[-1]
+        for item in it:
+            if isinstance(item, int):
+                yield_(str(item), level)
+            else:
+                stack.append((iter(item), level + 1))
+                break
+        else:
+            stack.pop()
+
+
+@fake_coro
+def tree_recursive(iterable, level=0):
     for item in iterable:
         if isinstance(item, int):
             yield_(str(item), level)
         else:
-            yield_from(tree(item, level + 1))
+            yield_from(tree_recursive(item, level + 1))
+
+
+def nested(depth):
+    iterable = [0]
+    for _ in range(depth):
+        iterable = [iterable, 1]
+    return iterable
+
+
+EXPECTED_TREE_OUT = (
+    '0\n'
+    '1\n'
+    '..2\n'
+    '..3\n'
+    '..4\n'
+    '...5\n'
+    '...6\n'
+    '..7\n'
+    '.8\n'
+    '...9\n'
+)
+
+
+@fake_coro
+def chain_gen(n):
+    yield_(n)
+    if n:
+        yield_from(chain_gen(n - 1))
 
 
 def to_str(arg):
@@ -36,29 +83,35 @@ def func3():
         return 42
 
 
-def test_yield_from(capfd):
+@fake_coro
+def func4():
+    yield_from(func1())
+    yield_('done')
+
+
+def gen():
+    try:
+        yield
+    except ZeroDivisionError:
+        return 43
+
+
+def test_yield_from(capsys):
     iterable = [0, 1, [[2, 3, 4], [[5, 6], 7], 8], [[[9]]]]
-    print('\n'.join(map(to_str, tree(iterable))))
-    captured = capfd.readouterr()
-    assert captured.out == (
-        '0\n'
-        '1\n'
-        '..2\n'
-        '..3\n'
-        '..4\n'
-        '...5\n'
-        '...6\n'
-        '..7\n'
-        '.8\n'
-        '...9\n'
-    )
-
-    coro = tree(iterable)
-    next(coro)
-    next(coro)
-    next(coro)
-    with pytest.raises(ZeroDivisionError):
-        coro.throw(ZeroDivisionError)
+    sys.stdout.write('\n'.join(to_str(x) for x in tree(iterable)) + '\n')
+    captured = capsys.readouterr()
+    assert captured.out == EXPECTED_TREE_OUT
+
+    assert list(tree_recursive(iterable)) == list(tree(iterable))
+
+    for coro in [tree(iterable), tree_recursive(iterable)]:
+        next(coro)
+        next(coro)
+        assert next(coro) == ('2', 2)
+        with pytest.raises(ZeroDivisionError):
+            coro.throw(ZeroDivisionError)
+        with pytest.raises(StopIteration):
+            next(coro)
 
     coro = func1()
     assert next(coro) == -1
@@ -85,3 +138,41 @@ def test_yield_from(capfd):
     next(coro)
     with pytest.raises(StopIteration, match='42'):
         coro.throw(ZeroDivisionError)
+
+    coro = func2(gen())
+    next(coro)
+    with pytest.raises(StopIteration, match='43'):
+        coro.throw(ZeroDivisionError)
+
+    inner = func4()
+    coro = func2(inner)
+    assert next(coro) == -1
+    assert next(coro) == 0
+    assert list(itertools.islice(inner, 10)) == [*range(1, 10), 'done']
+    with pytest.raises(StopIteration):
+        next(coro)
+
+
+def test_yield_from_deep():
+    depth = 1000
+    result = list(tree(nested(depth)))
+    assert len(result) == depth + 1
+    assert result[0] == ('0', depth)
+    assert result[1:] == [('1', level) for level in range(depth - 1, -1, -1)]
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('depth', [10, 100, 1000])
+def test_yield_from_chain(depth):
+    assert list(chain_gen(depth)) == list(range(depth, -1, -1))
+
+
+@pytest.mark.slow
+def test_yield_from_chain_scaling():
+    elapsed = {}
+    for depth in [10, 100, 1000]:
+        t = time.perf_counter()
+        list(chain_gen(depth))
+        elapsed[depth] = time.perf_counter() - t
+    # linear growth would give a ratio of about 10
+    assert elapsed[1000] / elapsed[100] < 20